@@ -2,11 +2,12 @@
 Basic backend client stub.
 """
 
-import json
-import urllib.request
-import urllib.error
 from typing import Dict, Any, Optional
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 import config
 import event_queue
 
@@ -15,23 +16,29 @@ class BackendClient:
     def __init__(self, endpoint: Optional[str] = None, timeout: int = config.BACKEND_TIMEOUT):
         self.endpoint = endpoint or config.BACKEND_ENDPOINT
         self.timeout = timeout
+        # One keep-alive session per client so bursts of events reuse the TCP/TLS connection.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=4,
+            max_retries=Retry(total=2, backoff_factor=0.1),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers.update({"Content-Type": "application/json"})
 
     def send_event(self, event: Dict[str, Any]) -> None:
         if not self.endpoint:
             event_queue.enqueue(event)
             return
-        payload = json.dumps(event).encode("utf-8")
-        req = urllib.request.Request(
-            self.endpoint,
-            data=payload,
-            headers={"Content-Type": "application/json"},
-        )
         try:
-            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
-                if resp.status >= 400:
-                    raise urllib.error.HTTPError(
-                        req.full_url, resp.status, "server error", resp.headers, None
-                    )
+            resp = self._session.post(
+                self.endpoint, data=event_queue.dumps(event), timeout=self.timeout
+            )
+            resp.raise_for_status()
         except Exception as exc:
             event_queue.enqueue(event)
             raise RuntimeError(f"failed to POST event: {exc}") from exc
+
+    def close(self) -> None:
+        self._session.close()
@@ -1,72 +1,144 @@
 """
 Helpers for caching dataset baselines (from legacy CSVs or control WAVs).
+
+A baseline is a ``BaselineView(freqs, vals)`` of sorted int32 frequency bins and
+the matching float32 log-magnitude averages. The cached .npy pair is reused only while
+the ``.sig.json`` written next to it still matches the source files' mtimes and sizes.
 """
 
+import json
+import os
+from collections import defaultdict
 from pathlib import Path
-from typing import Optional
+from typing import Any, List, NamedTuple, Optional, Tuple
 
-import joblib
-import pandas as pd
+import numpy as np
 
 import config
 import feature_extractor as feat
 
 
-def _cache_path(dataset_name: str) -> Path:
+CONTROL_BATCH = 4
+
+
+class BaselineView(NamedTuple):
+    freqs: np.ndarray
+    vals: np.ndarray
+
+
+def _cache_paths(dataset_name: str) -> Tuple[Path, Path, Path]:
     target = Path(config.BASELINE_CACHE_DIR)
     target.mkdir(parents=True, exist_ok=True)
-    return target / f"{dataset_name}_baseline.joblib"
+    return (
+        target / f"{dataset_name}.freqs.npy",
+        target / f"{dataset_name}.vals.npy",
+        target / f"{dataset_name}.sig.json",
+    )
 
 
-def _load_from_summary(dataset_dir: Path) -> Optional[pd.Series]:
+def _summary_paths(dataset_dir: Path) -> Tuple[Path, Path]:
     summary_dir = Path(config.LEGACY_SUMMARY_DIR) / dataset_dir.name
-    control_csv = summary_dir / "control.csv"
-    mean_csv = summary_dir / "control_mean.csv"
+    return summary_dir / "control.csv", summary_dir / "control_mean.csv"
+
+
+def _load_from_summary(dataset_dir: Path) -> Optional[BaselineView]:
+    control_csv, mean_csv = _summary_paths(dataset_dir)
     if not control_csv.exists() or not mean_csv.exists():
         return None
 
     try:
+        import pandas as pd  # deferred: only legacy datasets ship summary CSVs
+
         freq_df = pd.read_csv(control_csv, header=None, nrows=1)
-        freq_series = freq_df.iloc[0].dropna()
-        freq_index = freq_series.astype(np.int32)
+        freqs = freq_df.iloc[0].dropna().to_numpy().astype(np.int32)
         mean_df = pd.read_csv(mean_csv, header=None)
-        mean_values = mean_df.iloc[:, 0]
+        values = mean_df.iloc[:, 0].to_numpy(dtype=np.float32)
     except Exception:
         return None
 
-    min_len = min(len(freq_index), len(mean_values))
-    freq_index = freq_index.iloc[:min_len]
-    mean_values = mean_values.iloc[:min_len]
-    baseline = pd.Series(mean_values.values, index=freq_index.astype(np.int32))
-    return baseline
+    min_len = min(len(freqs), len(values))
+    freqs = freqs[:min_len]
+    values = values[:min_len]
+    order = np.argsort(freqs, kind="stable")
+    return BaselineView(freqs[order], values[order])
 
 
-def _compute_from_controls(dataset_dir: Path) -> Optional[pd.Series]:
-    frames = []
+def _source_signature(dataset_dir: Path) -> List[List[Any]]:
+    """(path, mtime_ns, size) of every file a baseline can be built from."""
+    sources = [path for path in _summary_paths(dataset_dir) if path.exists()]
+    sources += sorted(dataset_dir.glob("control*.wav"))
+    signature = []
+    for source in sources:
+        stat = source.stat()
+        signature.append([str(source), stat.st_mtime_ns, stat.st_size])
+    return signature
+
+
+def _compute_from_controls(dataset_dir: Path) -> Optional[BaselineView]:
+    by_length = defaultdict(list)
     for control in sorted(dataset_dir.glob("control*.wav")):
         samples, sr = feat.load_wav(control, target_sr=config.TARGET_SAMPLE_RATE)
         proc, _ = feat.preprocess_signal(samples, sr)
-        frames.append(feat.fft(proc, log_mag=True, thresh=0))
-    if not frames:
+        by_length[len(proc)].append(proc)
+    if not by_length:
         return None
-    baseline = pd.concat(frames).mean()
-    return baseline
+
+    # Equal-length controls share batched spectra (padded=False as in feat.fft); batches
+    # are capped because each control's (freq, frames) magnitude is tens of MiB.
+    freqs_int = None
+    frames = []
+    for procs in by_length.values():
+        for start in range(0, len(procs), CONTROL_BATCH):
+            freqs, _, mags = feat.compute_spectrum(
+                np.stack(procs[start : start + CONTROL_BATCH]),
+                config.TARGET_SAMPLE_RATE,
+                padded=False,
+            )
+            for mag in mags:
+                freqs_int, values = feat.fft(
+                    None, log_mag=True, thresh=0, precomputed=(freqs, mag)
+                )
+                frames.append(values)
+            del mags
+    return BaselineView(freqs_int, np.stack(frames).mean(axis=0))
+
+
+def _save_replacing(path: Path, array: np.ndarray) -> None:
+    # The old file may still be mapped by an earlier BaselineView or read by another
+    # process; truncating it in place can SIGBUS them, so write privately and rename.
+    tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+    np.save(tmp_path, array)
+    os.replace(tmp_path, path)
 
 
-def get_baseline(dataset_dir: Path) -> Optional[pd.Series]:
-    cache_file = _cache_path(dataset_dir.name)
-    if cache_file.exists():
+def _load_cached(freqs_file: Path, vals_file: Path) -> BaselineView:
+    return BaselineView(
+        freqs=np.load(freqs_file, mmap_mode="r"),
+        vals=np.load(vals_file, mmap_mode="r"),
+    )
+
+
+def get_baseline(dataset_dir: Path) -> Optional[BaselineView]:
+    """Return the dataset baseline backed by read-only memory-mapped .npy files."""
+    freqs_file, vals_file, sig_file = _cache_paths(dataset_dir.name)
+    signature = _source_signature(dataset_dir)
+    if freqs_file.exists() and vals_file.exists() and sig_file.exists():
         try:
-            baseline = joblib.load(cache_file)
-            if isinstance(baseline, pd.Series):
-                return baseline
+            if json.loads(sig_file.read_text()) == signature:
+                return _load_cached(freqs_file, vals_file)
         except Exception:
             pass
 
     baseline = _load_from_summary(dataset_dir)
     if baseline is None:
         baseline = _compute_from_controls(dataset_dir)
+    if baseline is None:
+        return None
 
-    if baseline is not None:
-        joblib.dump(baseline, cache_file)
-    return baseline
+    _save_replacing(freqs_file, np.asarray(baseline.freqs, dtype=np.int32))
+    _save_replacing(vals_file, np.asarray(baseline.vals, dtype=np.float32))
+    # Written last so an interrupted save never leaves a valid signature on stale arrays.
+    tmp_sig = sig_file.with_name(f"{sig_file.name}.{os.getpid()}.tmp")
+    tmp_sig.write_text(json.dumps(signature))
+    os.replace(tmp_sig, sig_file)
+    return _load_cached(freqs_file, vals_file)
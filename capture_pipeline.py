@@ -1,6 +1,8 @@
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 
+import pandas as pd
 import sounddevice as sd
 
 import backend_client as backend
@@ -8,12 +10,12 @@ import config
 import device_calibration as calibration
 import event_queue as msg
 import feature_extractor as spec
+import fft_backend  # noqa: F401  (routes scipy.fft through pyFFTW when available)
 import llm_client
 import reasoning_engine as reasoning
 from model_manager import load_best_model, predict_with_confidence
-from scipy.io.wavfile import read
 
-_, PLAYBACK_ARRAY = read(config.PLAYBACK_FILE)
+PLAYBACK_ARRAY, _ = spec.load_wav(config.PLAYBACK_FILE)
 
 
 def chirp():
@@ -23,16 +25,27 @@ def chirp():
     return rec[:, 0]
 
 
+def process_control(control, calibration_profile):
+    control_proc, _ = spec.preprocess_signal(control, config.TARGET_SAMPLE_RATE)
+    control_proc = spec.apply_calibration(control_proc, calibration_profile)
+    return spec.fft(control_proc, log_mag=True)
+
+
 def main():
     model, model_path = load_best_model()
     client = backend.BackendClient()
     device_id = os.environ.get("DEVICE_ID", config.DEVICE_ID_DEFAULT)
 
+    calibration_profile = calibration.load_calibration(device_id)
+
     control = chirp()
 
-    print("Press Enter to record sample chirp")
-    input()
-    sample = chirp()
+    # Filter + FFT the control chirp while waiting on the user; NumPy/SciPy release the GIL.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        control_future = pool.submit(process_control, control, calibration_profile)
+        print("Press Enter to record sample chirp")
+        input()
+        sample = chirp()
 
     sample_proc, sample_snr = spec.preprocess_signal(sample, config.TARGET_SAMPLE_RATE)
     sample_db = spec.rms_db(sample_proc)
@@ -43,21 +56,21 @@ def main():
         print("Capture too noisy; try again in a quieter spot.")
         return
 
-    control_proc, _ = spec.preprocess_signal(control, config.TARGET_SAMPLE_RATE)
-
-    calibration_profile = calibration.load_calibration(device_id)
     if calibration_profile:
         sample_proc = spec.apply_calibration(sample_proc, calibration_profile)
-        control_proc = spec.apply_calibration(control_proc, calibration_profile)
 
-    control_fft = spec.fft(control_proc, log_mag=True)
-    sample_fft = spec.fft(sample_proc, log_mag=True)
+    freqs_int, control_fft = control_future.result()
+    _, sample_fft = spec.fft(sample_proc, log_mag=True)
     sample_fft = sample_fft - control_fft
 
     freqs, _, mag = spec.compute_spectrum(sample_proc, config.TARGET_SAMPLE_RATE)
-    summary = spec.spectral_summary(freqs, mag, sample_proc, config.TARGET_SAMPLE_RATE)
-    preds, confidence = predict_with_confidence(model, sample_fft)
+    summary = spec.spectral_summary(
+        freqs, mag, sample_proc, config.TARGET_SAMPLE_RATE, compute_mel=False
+    )
+    sample_frame = pd.DataFrame(sample_fft[None, :], columns=freqs_int)
+    preds, confidences = predict_with_confidence(model, sample_frame)
     pred = preds[0]
+    confidence = float(confidences[0])
 
     quality = {"snr_db": sample_snr, "calibrated": bool(calibration_profile)}
     quality.update(summary)
@@ -92,8 +105,8 @@ def main():
 
     context_events = msg.tail_events(max(config.LLM_CONTEXT_SIZE - 1, 1))
     context_events.append(event)
-    llm_api = llm_client.LLMClient()
-    llm_response = llm_api.ask(config.LLM_DEFAULT_QUESTION, events=context_events)
+    with llm_client.LLMClient() as llm_api:
+        llm_response = llm_api.ask(config.LLM_DEFAULT_QUESTION, events=context_events)
     print("LLM insight:", llm_response["text"])
 
 
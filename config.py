@@ -21,10 +21,19 @@ DATA_AUDIO_DIR = DATA_ROOT / "raw"
 DATA_FEATURE_DIR = DATA_ROOT / "processed"
 LEGACY_SUMMARY_DIR = DATA_FEATURE_DIR
 BASELINE_CACHE_DIR = BASE_DIR / "cache" / "baseline"
+FEATURE_CACHE_DIR = BASE_DIR / "cache" / "features"
+
+# Training
+N_WORKERS = -1  # joblib n_jobs for per-file feature extraction
 
 # Quality thresholds
 SILENCE_DB_THRESHOLD = -45.0  # reject if average level below this
 MIN_SNR_DB = 8.0              # reject if SNR below this
+# Raw-sample gates applied before preprocessing (training). A peak below
+# PRE_SILENCE_THRESH can't reach SILENCE_DB_THRESHOLD RMS after the highpass.
+MIN_SAMPLES_SEC = 0.05
+PRE_SILENCE_THRESH = 10.0 ** (SILENCE_DB_THRESHOLD / 20.0)
+MAX_CLIP_SEC = 10.0           # only decode this much of each training WAV
 
 # Paths
 PLAYBACK_FILE = BASE_DIR / "playback" / "audiocheck.net_sweep_10Hz_22000Hz_-3dBFS_1s_nm.wav"
@@ -49,6 +58,11 @@ LLM_ENDPOINT = os.environ.get("PERPLEXITY_PRO_ENDPOINT")
 LLM_API_KEY_ENV = "PERPLEXITY_PRO_API_KEY"
 LLM_TIMEOUT = 10
 LLM_CONTEXT_SIZE = 6
+LLM_MAX_CONCURRENCY = 4
+LLM_CACHE_DIR = BASE_DIR / "cache" / "llm"
+LLM_CACHE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+LLM_CACHE_THRESHOLD = 0.1     # max cosine distance for a semantic cache hit
+LLM_CACHE_TTL_SEC = 3600
 LLM_SYSTEM_PROMPT = (
     "You summarize short acoustic classifiers and offer advice for a mobile sustainability app."
 )
@@ -3,13 +3,46 @@ Minimal offline message queue for desktop testing.
 """
 
 import json
+import os
+from collections import deque
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 
 import config
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 
 REQUIRED_FIELDS = {"type", "timestamp"}
+TAIL_BLOCK_SIZE = 65536
+TAIL_RING_SIZE = max(config.LLM_CONTEXT_SIZE, 256)
+
+# Encoded lines of the most recent events per queue file, seeded from disk on first tail,
+# with the file's (st_size, st_mtime_ns) as of the last seed or mirrored enqueue. Any other
+# change to the file (another writer, truncation, rotation) re-seeds on the next tail.
+_RINGS: Dict[Path, Tuple[deque, Tuple[int, int]]] = {}
+
+
+def _json_default(obj: Any) -> Any:
+    # numpy scalars/arrays (e.g. float32 summary stats) for the stdlib encoder
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_json_default).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def validate_message(msg: Dict[str, Any]) -> None:
@@ -18,26 +51,87 @@ def validate_message(msg: Dict[str, Any]) -> None:
         raise ValueError(f"Missing required fields: {missing}")
 
 
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
 def enqueue(msg: Dict[str, Any]) -> None:
     validate_message(msg)
     path = Path(config.OFFLINE_QUEUE_PATH)
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a") as f:
-        f.write(json.dumps(msg) + "\n")
+    line = dumps(msg)
+    before = _file_stamp(path)
+    with path.open("ab") as f:
+        f.write(line + b"\n")
+    cached = _RINGS.pop(path, None)
+    if cached is not None and cached[1] == before:
+        # The ring was current, so it stays current with just this line appended.
+        ring, _ = cached
+        ring.append(line)
+        _RINGS[path] = (ring, _file_stamp(path))
+
+
+def _reverse_lines(f) -> Iterator[bytes]:
+    """Yield the lines of a binary file from last to first, reading fixed-size blocks."""
+    f.seek(0, os.SEEK_END)
+    pos = f.tell()
+    carry = b""
+    while pos > 0:
+        step = min(TAIL_BLOCK_SIZE, pos)
+        pos -= step
+        f.seek(pos)
+        lines = (f.read(step) + carry).split(b"\n")
+        carry = lines[0]
+        yield from reversed(lines[1:])
+    yield carry
+
+
+def _seed_ring(path: Path, stamp: Tuple[int, int]) -> deque:
+    ring = deque(maxlen=TAIL_RING_SIZE)
+    with path.open("rb") as f:
+        for line in _reverse_lines(f):
+            line = line.strip()
+            if line:
+                ring.appendleft(line)
+                if len(ring) == ring.maxlen:
+                    break
+    _RINGS[path] = (ring, stamp)
+    return ring
+
+
+def _parse_newest(lines: Iterable[bytes], limit: int) -> List[Dict[str, Any]]:
+    events = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            events.append(loads(line))
+        except ValueError:
+            continue
+        if len(events) >= limit:
+            break
+    return events
 
 
 def tail_events(limit: int = 10) -> List[Dict[str, Any]]:
     path = Path(config.OFFLINE_QUEUE_PATH)
-    if not path.exists():
+    if limit <= 0:
         return []
-    events = []
-    with path.open() as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                events.append(json.loads(line))
-            except json.JSONDecodeError:
-                continue
-    return events[-limit:]
+    stamp = _file_stamp(path)
+    if stamp is None:
+        _RINGS.pop(path, None)
+        return []
+    cached = _RINGS.get(path)
+    ring = cached[0] if cached is not None and cached[1] == stamp else _seed_ring(path, stamp)
+    events = _parse_newest(reversed(ring), limit)
+    if len(events) < limit and len(ring) == ring.maxlen and path.exists():
+        # More requested than the ring holds; fall back to reading the file.
+        with path.open("rb") as f:
+            events = _parse_newest(_reverse_lines(f), limit)
+    events.reverse()
+    return events
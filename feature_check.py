@@ -5,6 +5,7 @@ Inspect engineered features for a few WAV samples and (optionally) run the saved
 import argparse
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 import config
@@ -13,6 +14,10 @@ from baseline_cache import get_baseline
 from model_manager import load_best_model, predict_with_confidence
 
 
+# Model column names; the bin layout is fixed by config and the summary order is frozen.
+FEATURE_COLUMNS = feat.feature_columns(feat.spectrum_freqs().astype(np.int32))
+
+
 LABEL_KEYWORDS = [
     ("metal", "metal"),
     ("glass", "glass"),
@@ -35,24 +40,24 @@ def derive_label(filename: str):
     return None
 
 
-def build_feature_series(wav_path: Path, baseline: pd.Series):
+def build_feature_series(wav_path: Path, baseline):
     samples, sr = feat.load_wav(wav_path, target_sr=config.TARGET_SAMPLE_RATE)
     proc, snr = feat.preprocess_signal(samples, sr)
     freqs, _, mag = feat.compute_spectrum(proc, sr)
     if mag.size == 0:
         raise RuntimeError(f"No spectrum for {wav_path}")
 
-    vector = feat.fft(proc, log_mag=True, thresh=0, precomputed=(freqs, mag))
+    freqs_int, values = feat.fft(proc, log_mag=True, thresh=0, precomputed=(freqs, mag))
     if baseline is not None:
-        baseline_aligned = baseline.reindex(vector.columns, fill_value=0)
-        vector = vector.subtract(baseline_aligned, axis=1)
+        values -= feat.align_bins(baseline.freqs, baseline.vals, freqs_int)
 
-    extra = feat.spectral_summary(freqs, mag, proc, sr)
-    combined = pd.concat([vector.iloc[0], pd.Series(extra)])
-    combined = combined.replace([pd.NA, pd.NaT], 0)
-    combined = combined.replace([float("inf"), float("-inf")], 0).fillna(0)
-    combined.index = combined.index.astype(str)
-    return combined, {"snr_db": snr, **extra}
+    extra = feat.spectral_summary(freqs, mag, proc, sr, compute_mel=True)
+    combined = feat.combine_features(values, extra)
+    if len(combined) == len(FEATURE_COLUMNS):
+        columns = FEATURE_COLUMNS
+    else:
+        columns = feat.feature_columns(freqs_int)
+    return combined, columns, {"snr_db": snr, **extra}
 
 
 def select_samples(dataset: str, num: int):
@@ -81,7 +86,7 @@ def describe(args):
         return
 
     for wav in samples:
-        features, quality = build_feature_series(wav, baseline)
+        features, columns, quality = build_feature_series(wav, baseline)
         label = derive_label(wav.name) or "unknown"
         print(f"\nSample: {wav.name} (expected label: {label})")
         stat_line = ", ".join(
@@ -93,9 +98,9 @@ def describe(args):
             print("  stats:", stat_line)
         print("  snr_db:", quality.get("snr_db"))
         if args.predict and model is not None:
-            frame = pd.DataFrame([features])
+            frame = pd.DataFrame(features[None, :], columns=columns)
             preds, conf = predict_with_confidence(model, frame)
-            print("  model prediction:", preds[0], f"(conf={conf:.2f})")
+            print("  model prediction:", preds[0], f"(conf={conf[0]:.2f})")
 
     if args.predict and model_path:
         print(f"\nModel file used: {model_path}")
@@ -1,16 +1,76 @@
+import functools
+import threading
+
 import numpy as np
-from scipy.signal import stft, resample_poly, butter, filtfilt
+from scipy import fft as sp_fft
+from scipy.signal import get_window, resample_poly, butter, sosfiltfilt
 from scipy.fftpack import dct
-import pandas as pd
 from scipy.io import wavfile
 
 import config
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; NumPy fallbacks are used without it
+    njit = None
+
+try:
+    import soundfile as sf
+except (ImportError, OSError):  # soundfile/libsndfile is optional; wavfile is the fallback
+    sf = None
+
 EPSILON = 1e-9
 
+# Segment length used by scipy.signal.stft's defaults; each segment is
+# zero-padded to n_fft, so this sets the time resolution of the spectrogram.
+STFT_NPERSEG = 256
+
+# spectral_summary keys in the order the model's feature vector expects them after
+# the FFT bins (matches the training-time column order for n_mfcc=6).
+EXTRA_KEYS_ORDERED = (
+    "spectral_energy",
+    "spectral_energy_std",
+    "spectral_centroid",
+    "spectral_bandwidth",
+    "spectral_rolloff",
+    "spectral_flatness",
+    "spectral_flux",
+    "spectral_entropy",
+    "mel_mean",
+    "mel_std",
+    *(f"mfcc_mean_{idx}" for idx in range(6)),
+    *(f"mfcc_std_{idx}" for idx in range(6)),
+    "snr_db",
+    "noise_floor_db",
+    "rms_db",
+    "zero_crossing_rate",
+    "peak_db",
+    "crest_factor",
+    "duration_s",
+)
+
+_WINDOW_CACHE = {}
+_SCRATCH = threading.local()
+
+
+def load_wav(path, target_sr=None, max_seconds=None):
+    """Mono float32 samples; with ``max_seconds`` only the head of the file is decoded."""
+    if sf is not None:
+        # libsndfile decodes straight to float32; no int16 buffer or rescale copy.
+        source = path if hasattr(path, "read") else str(path)
+        with sf.SoundFile(source) as f:
+            sr = f.samplerate
+            frames = -1 if max_seconds is None else int(max_seconds * sr)
+            x = f.read(frames, dtype="float32", always_2d=False)
+    else:
+        sr, x = wavfile.read(path)
+        if max_seconds is not None:
+            x = x[: int(max_seconds * sr)]
+    return from_samples(x, sr, target_sr=target_sr)
+
 
-def load_wav(path, target_sr=None):
-    sr, x = wavfile.read(path)
+def from_samples(x, sr, target_sr=None):
+    """Mono float32 samples (resampled to target_sr) from raw wavfile.read output."""
     if x.ndim > 1:
         x = x[:, 0]
     x = to_float32(x)
@@ -21,10 +81,21 @@ def load_wav(path, target_sr=None):
 
 
 def ensure_min_length(x, min_length):
-    if len(x) >= min_length or min_length <= 0:
+    if x.shape[-1] >= min_length or min_length <= 0:
         return x
-    pad = min_length - len(x)
-    return np.pad(x, (0, pad), mode="reflect")
+    pad = min_length - x.shape[-1]
+    return np.pad(x, [(0, 0)] * (x.ndim - 1) + [(0, pad)], mode="reflect")
+
+
+def _stft_window(window, nperseg):
+    """Window scaled by 1/sum(window), matching stft's "spectrum" scaling."""
+    key = (window, nperseg)
+    win = _WINDOW_CACHE.get(key)
+    if win is None:
+        win = get_window(window, nperseg)
+        win = (win / win.sum()).astype(np.float32)
+        _WINDOW_CACHE[key] = win
+    return win
 
 
 def compute_spectrum(
@@ -35,27 +106,94 @@ def compute_spectrum(
     padded=True,
     fmin=None,
     fmax=None,
+    workers=-1,
 ):
+    """
+    Magnitude STFT of x over the [fmin, fmax] band.
+
+    x may carry leading batch dimensions (equal-length signals stacked on axis 0);
+    mag then has shape (..., freq, frames) and all rows go through one rfft call.
+    workers is passed to scipy.fft.rfft; process-parallel callers should use 1.
+    """
     n_fft = n_fft or config.N_FFT
     window = window or config.WINDOW
     fmin = config.FMIN if fmin is None else fmin
     fmax = config.FMAX if fmax is None else fmax
 
-    x = ensure_min_length(x, n_fft)
-    freqs, times, stft_matrix = stft(
-        x,
-        nfft=n_fft,
-        fs=sr,
-        window=window,
-        padded=padded,
-    )
-    mag = np.abs(stft_matrix) + EPSILON
-    mask = np.logical_and(freqs >= fmin, freqs <= fmax)
-    if not mask.any():
-        mask = slice(None)
-    freqs = freqs[mask]
-    mag = mag[mask, :]
-    return freqs, times, mag
+    settings = (n_fft, sr, window, fmin, fmax)
+    if settings == _DEFAULT_SPECTRUM.settings:
+        return _DEFAULT_SPECTRUM(x, padded, workers)
+    return _make_spectrum(*settings)(x, padded, workers)
+
+
+def _make_spectrum(n_fft, sr, window, fmin, fmax):
+    """compute_spectrum with the frequency grid and band bounds resolved up front."""
+    freqs = sp_fft.rfftfreq(n_fft, 1.0 / sr)
+    band = _band_slice(freqs, fmin, fmax)
+    freqs = freqs[band]
+    freqs.setflags(write=False)
+
+    def compute(x, padded=True, workers=-1):
+        x = ensure_min_length(np.asarray(x).astype(np.float32, copy=False), n_fft)
+        length = x.shape[-1]
+        nperseg = min(STFT_NPERSEG, length)
+        hop = nperseg - nperseg // 2
+        edge = nperseg // 2
+        # Zero boundary extension plus optional tail padding, as stft does.
+        tail = (-(length + 2 * edge - nperseg) % hop) % nperseg if padded else 0
+        x = np.pad(x, [(0, 0)] * (x.ndim - 1) + [(edge, edge + tail)])
+
+        frames = np.lib.stride_tricks.sliding_window_view(x, nperseg, axis=-1)[..., ::hop, :]
+        segments = frames * _stft_window(window, nperseg)
+        spectrum = sp_fft.rfft(segments, n=n_fft, axis=-1, workers=workers)[..., band]
+        # Swap the last two axes while taking the magnitude so mag is a contiguous
+        # (..., freq, frames) array.
+        spectrum = np.swapaxes(spectrum, -1, -2)
+        mag = np.abs(spectrum, out=np.empty(spectrum.shape, dtype=spectrum.real.dtype))
+        np.add(mag, np.float32(EPSILON), out=mag)
+
+        times = np.arange(mag.shape[-1]) * hop / sr
+        return freqs, times, mag
+
+    compute.settings = (n_fft, sr, window, fmin, fmax)
+    return compute
+
+
+def _band_slice(freqs, fmin, fmax):
+    # rfftfreq output is sorted, so the [fmin, fmax] band is a contiguous slice.
+    lo = np.searchsorted(freqs, fmin, side="left")
+    hi = np.searchsorted(freqs, fmax, side="right")
+    if lo >= hi:
+        return slice(None)
+    return slice(lo, hi)
+
+
+def spectrum_freqs(sr=None, n_fft=None, fmin=None, fmax=None):
+    """Frequencies of the rows compute_spectrum keeps for these settings."""
+    sr = sr or config.TARGET_SAMPLE_RATE
+    n_fft = n_fft or config.N_FFT
+    fmin = config.FMIN if fmin is None else fmin
+    fmax = config.FMAX if fmax is None else fmax
+    freqs = sp_fft.rfftfreq(n_fft, 1.0 / sr)
+    return freqs[_band_slice(freqs, fmin, fmax)]
+
+
+# Every production call uses the config settings; build that variant once at import.
+_DEFAULT_SPECTRUM = _make_spectrum(
+    config.N_FFT, config.TARGET_SAMPLE_RATE, config.WINDOW, config.FMIN, config.FMAX
+)
+
+
+def align_bins(src_freqs, src_values, dst_freqs, fill_value=0.0):
+    """Gather src_values onto dst_freqs (both sorted); unmatched bins get fill_value."""
+    out = np.full(len(dst_freqs), fill_value, dtype=np.float32)
+    if len(src_freqs) == 0:
+        return out
+    idx = np.searchsorted(src_freqs, dst_freqs)
+    np.minimum(idx, len(src_freqs) - 1, out=idx)
+    hit = src_freqs[idx] == dst_freqs
+    out[hit] = src_values[idx[hit]]
+    return out
 
 
 def fft(
@@ -78,25 +216,83 @@ def fft(
         freqs, mag = precomputed
 
     if log_mag:
-        mag = np.log10(mag)
-
-    avg = avg_thresh(mag, thresh=thresh)
+        avg = avg_log_thresh(mag, thresh=thresh)
+    else:
+        avg = avg_thresh(mag, thresh=thresh)
     freqs_int = freqs.astype(np.int32)
-    df = pd.DataFrame(columns=freqs_int)
-    df.loc[0] = avg
-    return df
+    return freqs_int, avg.astype(np.float32, copy=False)
 
 
-def avg_thresh(fft, thresh=0.0001):
-    fft = fft.copy()
-    fft[fft < thresh] = np.nan
-    valid = ~np.isnan(fft)
-    counts = np.sum(valid, axis=1)
-    sums = np.nansum(fft, axis=1)
-    result = np.zeros_like(sums)
-    mask = counts > 0
-    result[mask] = sums[mask] / counts[mask]
-    return result
+def combine_features(values, extra):
+    """FFT vector followed by the summary stats in EXTRA_KEYS_ORDERED; non-finite -> 0."""
+    stats = np.fromiter(
+        (extra.get(key, 0.0) for key in EXTRA_KEYS_ORDERED),
+        dtype=np.float32,
+        count=len(EXTRA_KEYS_ORDERED),
+    )
+    combined = np.concatenate([np.asarray(values, dtype=np.float32), stats])
+    return np.nan_to_num(combined, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def feature_columns(freqs_int):
+    return [str(f) for f in freqs_int] + list(EXTRA_KEYS_ORDERED)
+
+
+def avg_thresh(fft, thresh=0.0001, out=None):
+    """Per-row mean of the entries >= thresh (0 for rows with none)."""
+    if out is None:
+        out = np.empty(fft.shape[0], dtype=np.float32)
+    if njit is not None:
+        _avg_thresh_kernel(fft, float(thresh), out)
+        return out
+    mask = fft >= thresh
+    counts = mask.sum(axis=1)
+    sums = np.einsum("ij,ij->i", fft, mask)
+    np.divide(sums, counts, out=out, where=counts > 0, casting="unsafe")
+    out[counts == 0] = 0.0
+    return out
+
+
+def avg_log_thresh(mag, thresh=0.0001, out=None):
+    """avg_thresh(np.log10(mag), thresh) without materializing the log array."""
+    if njit is None:
+        return avg_thresh(np.log10(mag), thresh=thresh, out=out)
+    if out is None:
+        out = np.empty(mag.shape[0], dtype=np.float32)
+    _avg_log_thresh_kernel(mag, float(thresh), out)
+    return out
+
+
+if njit is not None:
+
+    # Serial on purpose: the server calls these from a thread pool, and numba's workqueue
+    # threading layer aborts the process on concurrent parallel regions.
+    @njit(fastmath=True, cache=True)
+    def _avg_log_thresh_kernel(mag, thresh, out):
+        # log10(v) >= thresh  <=>  v >= 10**thresh, so the mask is tested on the raw
+        # magnitude and the (scalar, non-SIMD) log is only taken for kept entries.
+        floor = 10.0**thresh
+        for i in range(mag.shape[0]):
+            total = 0.0
+            count = 0
+            for j in range(mag.shape[1]):
+                value = mag[i, j]
+                if value >= floor:
+                    total += np.log10(value)
+                    count += 1
+            out[i] = total / count if count > 0 else 0.0
+
+    @njit(fastmath=True, cache=True)
+    def _avg_thresh_kernel(mag, thresh, out):
+        for i in range(mag.shape[0]):
+            total = 0.0
+            count = 0
+            for j in range(mag.shape[1]):
+                value = mag[i, j]
+                if value >= thresh:
+                    total += value
+                    count += 1
+            out[i] = total / count if count > 0 else 0.0
 
 
 def to_float32(x):
@@ -104,7 +300,7 @@ def to_float32(x):
         max_val = np.iinfo(x.dtype).max
         x = x.astype(np.float32) / max_val
     else:
-        x = x.astype(np.float32)
+        x = x.astype(np.float32, copy=False)
     return x
 
 
@@ -112,12 +308,19 @@ def resample_audio(x, sr, target_sr):
     gcd = np.gcd(sr, target_sr)
     up = target_sr // gcd
     down = sr // gcd
-    return resample_poly(x, up, down)
+    return resample_poly(x, up, down).astype(np.float32, copy=False)
+
+
+@functools.lru_cache(maxsize=8)
+def _design_highpass_sos(sr, cutoff, order=2):
+    return butter(order, cutoff / (0.5 * sr), btype="highpass", output="sos")
 
 
 def highpass_dc(x, sr, cutoff=20.0):
-    b, a = butter(2, cutoff / (0.5 * sr), btype="highpass")
-    return filtfilt(b, a, x)
+    # Coefficients and filter state stay float64: the 20 Hz poles sit close to the
+    # unit circle and a float32 recursion drifts by ~5e-4. Only the output is float32.
+    sos = _design_highpass_sos(sr, cutoff)
+    return sosfiltfilt(sos, x).astype(np.float32, copy=False)
 
 
 def rms_db(x, eps=1e-9):
@@ -159,75 +362,82 @@ def mel_to_freq(mel):
 
 
 def build_mel_filterbank(freqs, n_mels=24, fmin=None, fmax=None):
+    """Triangular mel filters over freqs; cached, so the result is read-only."""
+    freqs = np.asarray(freqs, dtype=np.float64)
     if freqs.size == 0:
-        return np.zeros((n_mels, 0))
+        return np.zeros((n_mels, 0), dtype=np.float32)
     fmin = freqs[0] if fmin is None else fmin
     fmax = freqs[-1] if fmax is None else fmax
-    mel_min = freq_to_mel(fmin)
-    mel_max = freq_to_mel(fmax)
-    mel_points = np.linspace(mel_min, mel_max, n_mels + 2)
+    return _mel_filterbank(freqs.tobytes(), n_mels, float(fmin), float(fmax))
+
+
+@functools.lru_cache(maxsize=8)
+def _mel_filterbank(freqs_bytes, n_mels, fmin, fmax):
+    freqs = np.frombuffer(freqs_bytes, dtype=np.float64)
+    mel_points = np.linspace(freq_to_mel(fmin), freq_to_mel(fmax), n_mels + 2)
     hz_points = mel_to_freq(mel_points)
 
-    filter_bank = np.zeros((n_mels, freqs.size))
-    for i in range(n_mels):
-        left = hz_points[i]
-        center = hz_points[i + 1]
-        right = hz_points[i + 2]
-        if center <= left or right <= center:
-            continue
-        left_mask = np.logical_and(freqs >= left, freqs <= center)
-        right_mask = np.logical_and(freqs >= center, freqs <= right)
-        if np.any(left_mask):
-            filter_bank[i, left_mask] = (freqs[left_mask] - left) / (center - left)
-        if np.any(right_mask):
-            filter_bank[i, right_mask] = (right - freqs[right_mask]) / (right - center)
+    left = hz_points[:-2, None]
+    center = hz_points[1:-1, None]
+    right = hz_points[2:, None]
+    up = (freqs[None, :] - left) / np.maximum(center - left, EPSILON)
+    down = (right - freqs[None, :]) / np.maximum(right - center, EPSILON)
+    filter_bank = np.clip(np.minimum(up, down), 0, None).astype(np.float32)
+    degenerate = np.logical_or(center <= left, right <= center)[:, 0]
+    filter_bank[degenerate] = 0.0
+    filter_bank.setflags(write=False)
     return filter_bank
 
 
 def zero_crossing_rate(x):
     if len(x) < 2:
         return 0.0
-    signs = np.sign(x)
-    crossings = np.sum(np.abs(np.diff(signs))) / 2
+    if njit is not None:
+        return _zcr_kernel(x)
+    negative = np.signbit(x)
+    crossings = np.count_nonzero(negative[1:] != negative[:-1])
     return crossings / max(len(x) - 1, 1)
 
 
-def spectral_summary(
-    freqs,
-    mag,
-    x,
-    sr,
-    n_mels=24,
-    n_mfcc=6,
-    rolloff_pct=0.85,
-):
-    features = {}
-    if freqs.size == 0 or mag.size == 0:
-        features.update(
-            {
-                "spectral_centroid": 0.0,
-                "spectral_bandwidth": 0.0,
-                "spectral_rolloff": 0.0,
-                "spectral_flatness": 0.0,
-                "spectral_flux": 0.0,
-                "spectral_energy": 0.0,
-            }
-        )
-        return features
+if njit is not None:
+
+    @njit(cache=True)
+    def _zcr_kernel(x):
+        crossings = 0
+        prev = np.signbit(x[0])
+        for i in range(1, x.shape[0]):
+            cur = np.signbit(x[i])
+            if cur != prev:
+                crossings += 1
+            prev = cur
+        return crossings / (x.shape[0] - 1)
+
+
+def _scratch(shape, dtype):
+    """Per-thread reusable work buffer, grown on demand."""
+    size = int(np.prod(shape))
+    buf = getattr(_SCRATCH, "buf", None)
+    if buf is None or buf.dtype != dtype or buf.size < size:
+        buf = np.empty(size, dtype=dtype)
+        _SCRATCH.buf = buf
+    return buf[:size].reshape(shape)
+
+
+def _summary_stats(freqs, mag, rolloff_pct):
+    """(energy, energy_std, centroid, bandwidth, rolloff, flatness, flux, entropy)."""
+    if njit is not None:
+        return _summary_kernel(mag, freqs, rolloff_pct)
 
     mean_mag = mag.mean(axis=1) if mag.shape[1] > 0 else np.zeros_like(freqs)
     energy = mean_mag.sum()
-    features["spectral_energy"] = energy
-    features["spectral_energy_std"] = mean_mag.std()
+    energy_std = mean_mag.std()
 
     if energy > 0:
         centroid = np.sum(freqs * mean_mag) / energy
     else:
         centroid = 0.0
-    features["spectral_centroid"] = centroid
 
     bandwidth = np.sqrt(np.sum((freqs - centroid) ** 2 * mean_mag) / (energy + EPSILON))
-    features["spectral_bandwidth"] = bandwidth
 
     cumsum = np.cumsum(mean_mag)
     rolloff_level = rolloff_pct * energy
@@ -236,43 +446,158 @@ def spectral_summary(
         rolloff_freq = freqs[-1]
     else:
         rolloff_freq = freqs[idx]
-    features["spectral_rolloff"] = rolloff_freq
 
     arith = np.mean(mean_mag + EPSILON)
     geom = np.exp(np.mean(np.log(mean_mag + EPSILON)))
-    features["spectral_flatness"] = geom / (arith + EPSILON)
+    flatness = geom / (arith + EPSILON)
 
     if mag.shape[1] > 1:
-        diff = np.diff(mag, axis=1)
-        flux = np.mean(np.sqrt(np.sum(diff ** 2, axis=0)))
+        diff = _scratch((mag.shape[0], mag.shape[1] - 1), mag.dtype)
+        np.subtract(mag[:, 1:], mag[:, :-1], out=diff)
+        flux = np.mean(np.sqrt(np.einsum("ij,ij->j", diff, diff)))
     else:
         flux = 0.0
-    features["spectral_flux"] = flux
 
     entropy_prob = mean_mag / (energy + EPSILON)
     entropy = -np.sum(entropy_prob * np.log2(entropy_prob + EPSILON))
+    return energy, energy_std, centroid, bandwidth, rolloff_freq, flatness, flux, entropy
+
+
+if njit is not None:
+
+    @njit(fastmath=True, cache=True)
+    def _summary_kernel(mag, freqs, rolloff_pct):
+        # One streaming pass over mag for the per-bin means and frame-to-frame flux;
+        # everything else only touches the (n_bins,) mean spectrum.
+        n_bins, n_frames = mag.shape
+        mean_mag = np.empty(n_bins)
+        flux_sq = np.zeros(max(n_frames - 1, 0))
+        for i in range(n_bins):
+            prev = mag[i, 0]
+            row_sum = prev
+            for t in range(1, n_frames):
+                cur = mag[i, t]
+                row_sum += cur
+                delta = cur - prev
+                flux_sq[t - 1] += delta * delta
+                prev = cur
+            mean_mag[i] = row_sum / n_frames
+
+        energy = 0.0
+        weighted = 0.0
+        log_sum = 0.0
+        for i in range(n_bins):
+            energy += mean_mag[i]
+            weighted += freqs[i] * mean_mag[i]
+            log_sum += np.log(mean_mag[i] + EPSILON)
+        mean = energy / n_bins
+        centroid = weighted / energy if energy > 0 else 0.0
+
+        var = 0.0
+        spread = 0.0
+        entropy = 0.0
+        rolloff = freqs[n_bins - 1]
+        rolloff_level = rolloff_pct * energy
+        cumsum = 0.0
+        found = False
+        for i in range(n_bins):
+            m = mean_mag[i]
+            var += (m - mean) * (m - mean)
+            spread += (freqs[i] - centroid) ** 2 * m
+            p = m / (energy + EPSILON)
+            entropy -= p * np.log2(p + EPSILON)
+            cumsum += m
+            if not found and cumsum >= rolloff_level:
+                rolloff = freqs[i]
+                found = True
+
+        bandwidth = np.sqrt(spread / (energy + EPSILON))
+        arith = mean + EPSILON
+        flatness = np.exp(log_sum / n_bins) / (arith + EPSILON)
+
+        flux = 0.0
+        if n_frames > 1:
+            for t in range(n_frames - 1):
+                flux += np.sqrt(flux_sq[t])
+            flux /= n_frames - 1
+        return (
+            energy,
+            np.sqrt(var / n_bins),
+            centroid,
+            bandwidth,
+            rolloff,
+            flatness,
+            flux,
+            entropy,
+        )
+
+
+def spectral_summary(
+    freqs,
+    mag,
+    x,
+    sr,
+    *,
+    compute_mel=False,
+    n_mels=24,
+    n_mfcc=6,
+    rolloff_pct=0.85,
+):
+    """Summary stats for a spectrogram; mel/MFCC features only when ``compute_mel``."""
+    features = {}
+    if freqs.size == 0 or mag.size == 0:
+        features.update(
+            {
+                "spectral_centroid": 0.0,
+                "spectral_bandwidth": 0.0,
+                "spectral_rolloff": 0.0,
+                "spectral_flatness": 0.0,
+                "spectral_flux": 0.0,
+                "spectral_energy": 0.0,
+            }
+        )
+        return features
+
+    (
+        energy,
+        energy_std,
+        centroid,
+        bandwidth,
+        rolloff_freq,
+        flatness,
+        flux,
+        entropy,
+    ) = _summary_stats(freqs, mag, rolloff_pct)
+    features["spectral_energy"] = energy
+    features["spectral_energy_std"] = energy_std
+    features["spectral_centroid"] = centroid
+    features["spectral_bandwidth"] = bandwidth
+    features["spectral_rolloff"] = rolloff_freq
+    features["spectral_flatness"] = flatness
+    features["spectral_flux"] = flux
     features["spectral_entropy"] = entropy
 
-    mel_filters = build_mel_filterbank(freqs, n_mels=n_mels, fmin=freqs[0], fmax=freqs[-1])
-    if mel_filters.size:
-        mel_energy = mel_filters.dot(mag + EPSILON)
-        mel_mean = np.mean(mel_energy, axis=1)
-        mel_std = np.std(mel_energy, axis=1)
-        features["mel_mean"] = np.mean(mel_mean)
-        features["mel_std"] = np.mean(mel_std)
-        log_mel = np.log10(mel_energy + EPSILON)
-        mfcc = dct(log_mel, type=2, axis=0, norm="ortho")
-        mfcc = mfcc[: min(n_mfcc, mfcc.shape[0]), :]
-        mfcc_mean = np.mean(mfcc, axis=1)
-        mfcc_std = np.std(mfcc, axis=1)
-        for idx, coef in enumerate(mfcc_mean):
-            features[f"mfcc_mean_{idx}"] = coef
-        for idx, coef in enumerate(mfcc_std):
-            features[f"mfcc_std_{idx}"] = coef
-    else:
-        for idx in range(n_mfcc):
-            features[f"mfcc_mean_{idx}"] = 0.0
-            features[f"mfcc_std_{idx}"] = 0.0
+    if compute_mel:
+        mel_filters = build_mel_filterbank(freqs, n_mels=n_mels, fmin=freqs[0], fmax=freqs[-1])
+        if mel_filters.size:
+            mel_energy = mel_filters.dot(mag + np.float32(EPSILON))
+            mel_mean = np.mean(mel_energy, axis=1)
+            mel_std = np.std(mel_energy, axis=1)
+            features["mel_mean"] = np.mean(mel_mean)
+            features["mel_std"] = np.mean(mel_std)
+            log_mel = np.log10(mel_energy + np.float32(EPSILON))
+            mfcc = dct(log_mel, type=2, axis=0, norm="ortho")
+            mfcc = mfcc[: min(n_mfcc, mfcc.shape[0]), :]
+            mfcc_mean = np.mean(mfcc, axis=1)
+            mfcc_std = np.std(mfcc, axis=1)
+            for idx, coef in enumerate(mfcc_mean):
+                features[f"mfcc_mean_{idx}"] = coef
+            for idx, coef in enumerate(mfcc_std):
+                features[f"mfcc_std_{idx}"] = coef
+        else:
+            for idx in range(n_mfcc):
+                features[f"mfcc_mean_{idx}"] = 0.0
+                features[f"mfcc_std_{idx}"] = 0.0
 
     features["snr_db"] = estimate_snr_db(x)
     features["noise_floor_db"] = noise_floor_db(x)
@@ -283,4 +608,16 @@ def spectral_summary(
         (np.max(np.abs(x)) + EPSILON) / (np.sqrt(np.mean(np.square(x))) + EPSILON)
     )
     features["duration_s"] = len(x) / sr
-    return features
+    # Plain floats keep the summary JSON-serializable regardless of the array dtype.
+    return {key: float(value) for key, value in features.items()}
+
+
+def warmup(sr=config.TARGET_SAMPLE_RATE):
+    """Run the numba kernels once on a short signal so JIT compilation happens up front."""
+    if njit is None:
+        return
+    x = np.random.default_rng(0).standard_normal(sr // 10).astype(np.float32)
+    proc, _ = preprocess_signal(x, sr)
+    freqs, _, mag = compute_spectrum(proc, sr)
+    fft(None, log_mag=True, precomputed=(freqs, mag))
+    spectral_summary(freqs, mag, proc, sr)
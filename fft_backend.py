@@ -0,0 +1,37 @@
+"""
+Optional pyFFTW backend for scipy.fft.
+
+Importing this module routes scipy.fft (and so compute_spectrum) through FFTW with
+the planner cache enabled. Without pyFFTW installed, scipy's pocketfft stays in place.
+"""
+
+import os
+
+from scipy import fft as sp_fft
+
+try:
+    import pyfftw
+    import pyfftw.interfaces.scipy_fft as fftw_scipy
+except ImportError:  # pyFFTW is optional
+    pyfftw = None
+
+ENABLED = False
+
+
+def install() -> bool:
+    """Register pyFFTW as the global scipy.fft backend; plans are cached on first use."""
+    global ENABLED
+    if pyfftw is None:
+        return False
+    if ENABLED:
+        return True
+
+    threads = os.cpu_count() or 1
+    pyfftw.interfaces.cache.enable()
+    pyfftw.config.NUM_THREADS = threads
+    sp_fft.set_global_backend(fftw_scipy)
+    ENABLED = True
+    return True
+
+
+install()
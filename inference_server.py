@@ -28,14 +28,11 @@ from __future__ import annotations
 
 import base64
 import io
-import tempfile
 from typing import Any, Dict, Optional
 
-import numpy as np
 import pandas as pd
 from fastapi import FastAPI
 from pydantic import BaseModel
-from scipy.io import wavfile
 
 import config
 import feature_extractor as feat
@@ -72,11 +69,8 @@ def _extract_features_from_bytes(wav_bytes: bytes) -> Dict[str, Any]:
   - Build FFT vector
   - Compute spectral summary features
   """
-  # Write to a temporary file so we can reuse load_wav
-  with tempfile.NamedTemporaryFile(suffix=".wav") as tmp:
-    tmp.write(wav_bytes)
-    tmp.flush()
-    samples, sr = feat.load_wav(tmp.name, target_sr=config.TARGET_SAMPLE_RATE)
+  # Decode the WAV straight from memory (same decoder as training); no temp file
+  samples, sr = feat.load_wav(io.BytesIO(wav_bytes), target_sr=config.TARGET_SAMPLE_RATE)
 
   processed, snr = feat.preprocess_signal(samples, sr)
   if snr < config.MIN_SNR_DB:
@@ -91,7 +85,7 @@ def _extract_features_from_bytes(wav_bytes: bytes) -> Dict[str, Any]:
     raise ValueError("Empty spectrum from audio")
 
   # Single FFT vector (log magnitude, no thresholding)
-  vector = feat.fft(
+  freqs_int, values = feat.fft(
     processed,
     log_mag=True,
     thresh=0,
@@ -99,12 +93,11 @@ def _extract_features_from_bytes(wav_bytes: bytes) -> Dict[str, Any]:
   )
 
   # Add spectral summary features
-  extra = feat.spectral_summary(freqs, mag, processed, sr)
-  combined = pd.concat([vector.iloc[0], pd.Series(extra)])
-  combined = combined.replace([np.inf, -np.inf], 0).fillna(0)
+  extra = feat.spectral_summary(freqs, mag, processed, sr, compute_mel=True)
+  combined = feat.combine_features(values, extra)
 
   # Return as a single-row DataFrame plus extra quality metrics
-  X = pd.DataFrame([combined.values], columns=[str(c) for c in combined.index])
+  X = pd.DataFrame(combined[None, :], columns=feat.feature_columns(freqs_int))
   return {"X": X, "quality": extra}
 
 
@@ -134,6 +127,7 @@ def predict(req: PredictRequest) -> PredictResponse:
 
     preds, conf = model_manager.predict_with_confidence(MODEL, X)
     label = str(preds[0]) if len(preds) else None
+    confidence = float(conf[0]) if len(conf) else 0.0
 
     # Attach a few quality metrics we already computed
     quality = {
@@ -144,7 +138,7 @@ def predict(req: PredictRequest) -> PredictResponse:
       "duration_s": float(quality.get("duration_s", 0.0)),
     }
 
-    return PredictResponse(label=label, confidence=float(conf), quality=quality)
+    return PredictResponse(label=label, confidence=confidence, quality=quality)
   except Exception as exc:
     # For now return a neutral result with confidence 0.0
     # The frontend will treat this as \"no prediction\".
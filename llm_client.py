@@ -5,14 +5,21 @@ POSTs to the configured endpoint, falling back to a local explanation when crede
 or connectivity are unavailable.
 """
 
+import asyncio
+import hashlib
 import json
 import os
-from typing import Dict, Any, List, Optional
-
-import requests
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Sequence, Tuple
 
 import config
 import event_queue
+from semantic_cache import SemanticCache
+
+if TYPE_CHECKING:
+    import aiohttp
+    import requests
+
+# requests/aiohttp are imported on first network use: offline mode only builds prompts.
 
 
 STAT_FIELDS = (
@@ -24,6 +31,10 @@ STAT_FIELDS = (
     "zero_crossing_rate",
     "spectral_bandwidth",
 )
+_STAT_LABELS = tuple(key.replace("_", " ") for key in STAT_FIELDS)
+_EVENT_TMPL = "- {pred} (conf={conf}, SNR={snr} dB, device={dev}){stats}"
+_PROMPT_FOOTER = "Answer succinctly, mention confidence and any advice."
+_ANSWER_KEYS = ("answer", "response", "text", "output")
 
 
 def normalize_event(event: Dict[str, Any]) -> Dict[str, Any]:
@@ -41,31 +52,90 @@ def normalize_event(event: Dict[str, Any]) -> Dict[str, Any]:
     return normalized
 
 
-def build_prompt(events: List[Dict[str, Any]], question: str, system_prompt: str) -> str:
-    lines = [system_prompt, "", "Recent classifications:"]
-    if not events:
-        lines.append("- None recorded yet")
-    for evt in events:
+def event_signature(events: List[Dict[str, Any]], limit: int = 3) -> Tuple:
+    """Rounded view of the latest events so near-duplicate contexts share a cache key."""
+    signature = []
+    for evt in events[-limit:]:
         normalized = normalize_event(evt)
+        normalized.pop("timestamp", None)
         conf = normalized.get("confidence")
+        if isinstance(conf, (int, float)):
+            normalized["confidence"] = round(float(conf), 1)
         snr = normalized.get("snr_db")
-        device = normalized.get("device_id") or "unknown"
-        conf_str = f"{conf:.2f}" if isinstance(conf, (int, float)) else "n/a"
-        snr_str = f"{snr:.1f}" if isinstance(snr, (int, float)) else "n/a"
-        stat_vals = []
+        if isinstance(snr, (int, float)):
+            normalized["snr_db"] = round(float(snr))
         for key in STAT_FIELDS:
-            val = normalized.get(key)
-            if isinstance(val, (int, float)):
-                stat_vals.append(f"{key.replace('_', ' ')}={val:.1f}")
-        stat_text = f" | {'; '.join(stat_vals[:3])}" if stat_vals else ""
-        lines.append(
-            f"- {normalized.get('prediction') or 'unknown'} (conf={conf_str}, "
-            f"SNR={snr_str} dB, device={device}){stat_text}"
-        )
-    lines.append("")
-    lines.append(f"Question: {question}")
-    lines.append("Answer succinctly, mention confidence and any advice.")
-    return "\n".join(lines)
+            value = normalized.get(key)
+            if isinstance(value, (int, float)):
+                normalized[key] = float(f"{value:.2g}")
+        signature.append(tuple(sorted(normalized.items(), key=lambda item: item[0])))
+    return tuple(signature)
+
+
+def cache_key(question: str, events: List[Dict[str, Any]], limit: int = 3) -> Tuple[str, str]:
+    """
+    (exact, fuzzy) semantic cache keys.
+
+    ``exact`` hashes the rounded event signature, which must match exactly; ``fuzzy`` is
+    the question, the only free text, and is compared by embedding distance.
+    """
+    exact = hashlib.blake2b(
+        json.dumps(event_signature(events, limit), default=str).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    return exact, question
+
+
+def _fmt_num(value: Any, fmt: str) -> str:
+    try:
+        return format(value, fmt)
+    except (TypeError, ValueError):
+        return "n/a"
+
+
+def _stat_text(event: Dict[str, Any]) -> str:
+    parts = []
+    for key, label in zip(STAT_FIELDS, _STAT_LABELS):
+        try:
+            parts.append(f"{label}={event[key]:.1f}")
+        except (KeyError, TypeError, ValueError):
+            continue
+        if len(parts) == 3:
+            break
+    return f" | {'; '.join(parts)}" if parts else ""
+
+
+def _format_event(event: Dict[str, Any]) -> str:
+    return _EVENT_TMPL.format_map(
+        {
+            "pred": event.get("prediction") or "unknown",
+            "conf": _fmt_num(event.get("confidence"), ".2f"),
+            "snr": _fmt_num(event.get("snr_db"), ".1f"),
+            "dev": event.get("device_id") or "unknown",
+            "stats": _stat_text(event),
+        }
+    )
+
+
+def build_prompt(events: List[Dict[str, Any]], question: str, system_prompt: str) -> str:
+    body = "\n".join(_format_event(evt) for evt in events) if events else "- None recorded yet"
+    return (
+        f"{system_prompt}\n\nRecent classifications:\n{body}\n\n"
+        f"Question: {question}\n{_PROMPT_FOOTER}"
+    )
+
+
+def _disabled(prompt: str) -> Dict[str, Any]:
+    return {"text": "LLM disabled (endpoint or API key missing).", "prompt": prompt}
+
+
+def _failed(exc: Exception, prompt: str) -> Dict[str, Any]:
+    return {"text": f"LLM request failed: {exc}", "prompt": prompt, "raw": {}}
+
+
+def _answer_from(data: Dict[str, Any], prompt: str) -> Dict[str, Any]:
+    # First truthy answer field wins, as with the old chained ``or``.
+    text = next((data[key] for key in _ANSWER_KEYS if data.get(key)), None) or json.dumps(data)
+    return {"text": text, "prompt": prompt, "raw": data}
 
 
 class LLMClient:
@@ -74,38 +144,162 @@ class LLMClient:
         endpoint: Optional[str] = None,
         api_key: Optional[str] = None,
         timeout: int = config.LLM_TIMEOUT,
+        cache: Optional[SemanticCache] = None,
     ):
         self.endpoint = endpoint or config.LLM_ENDPOINT
         self.api_key = api_key or os.environ.get(config.LLM_API_KEY_ENV)
         self.timeout = timeout
         self.system_prompt = config.LLM_SYSTEM_PROMPT
+        self.cache = cache if cache is not None else SemanticCache()
+        # Keep-alive session for the blocking path so repeat asks skip the TCP/TLS handshake.
+        self._session_headers = {
+            "Content-Type": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+            "Authorization": f"Bearer {self.api_key}",
+        }
+        self._session: Optional["requests.Session"] = None
+        # Created lazily on the running loop; aiohttp sessions can't cross event loops.
+        self._aio_session: Optional["aiohttp.ClientSession"] = None
+        self._aio_lock: Optional[asyncio.Lock] = None
+        self._aio_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Open ask_async/ask_many calls plus ``async with`` blocks; the session is closed
+        # when this drops back to zero so asyncio.run(...) callers never leak it.
+        self._aio_users = 0
 
-    def ask(self, question: str, events: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    def _http_session(self) -> "requests.Session":
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(self._session_headers)
+            self._session = session
+        return self._session
+
+    async def _async_session(self) -> "aiohttp.ClientSession":
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        if self._aio_loop is not loop:
+            # A session/lock from a previous (possibly closed) loop is unusable here.
+            self._aio_session = None
+            self._aio_lock = asyncio.Lock()
+            self._aio_loop = loop
+        async with self._aio_lock:
+            if self._aio_session is None or self._aio_session.closed:
+                self._aio_session = aiohttp.ClientSession(
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                    headers=self._session_headers,
+                )
+        return self._aio_session
+
+    async def aclose(self) -> None:
+        session = self._aio_session
+        if session is not None and self._aio_loop is asyncio.get_running_loop():
+            await session.close()
+        self._aio_session = None
+        self._aio_lock = None
+        self._aio_loop = None
+
+    async def _release(self) -> None:
+        self._aio_users -= 1
+        if self._aio_users == 0:
+            await self.aclose()
+
+    async def __aenter__(self) -> "LLMClient":
+        self._aio_users += 1
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._release()
+
+    def _context(
+        self, question: str, events: Optional[List[Dict[str, Any]]]
+    ) -> Tuple[List[Dict[str, Any]], str]:
         events = events or event_queue.tail_events(config.LLM_CONTEXT_SIZE)
-        prompt = build_prompt(events, question, self.system_prompt)
-        if not self.endpoint or not self.api_key:
-            return {"text": "LLM disabled (endpoint or API key missing).", "prompt": prompt}
+        return events, build_prompt(events, question, self.system_prompt)
+
+    @staticmethod
+    def _cached_response(hit: Optional[Dict[str, Any]], prompt: str) -> Optional[Dict[str, Any]]:
+        if hit is None:
+            return None
+        return {"text": hit["text"], "prompt": prompt, "raw": {}, "cached": True}
+
+    def _enabled(self) -> bool:
+        return bool(self.endpoint and self.api_key)
+
+    async def ask_async(
+        self, question: str, events: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        events, prompt = self._context(question, events)
+        if not self._enabled():
+            return _disabled(prompt)
+        exact, key = cache_key(question, events)
+        # Embedding + vector query are blocking; keep them off the loop so ask_many overlaps.
+        hit = await asyncio.to_thread(self.cache.lookup, exact, key)
+        cached = self._cached_response(hit, prompt)
+        if cached is not None:
+            return cached
 
         payload = {"query": prompt}
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}",
-        }
+        self._aio_users += 1
         try:
-            resp = requests.post(self.endpoint, json=payload, headers=headers, timeout=self.timeout)
+            session = await self._async_session()
+            async with session.post(self.endpoint, json=payload) as resp:
+                resp.raise_for_status()
+                response = _answer_from(event_queue.loads(await resp.read()), prompt)
+        except Exception as exc:
+            return _failed(exc, prompt)
+        finally:
+            await self._release()
+        await asyncio.to_thread(self.cache.store, exact, key, response["text"])
+        return response
+
+    async def ask_many(
+        self, questions: Sequence[str], events: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Ask several questions concurrently against the same event context."""
+        events = events or event_queue.tail_events(config.LLM_CONTEXT_SIZE)
+        semaphore = asyncio.Semaphore(config.LLM_MAX_CONCURRENCY)
+
+        async def bounded(question: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.ask_async(question, events)
+
+        # Holding a reference keeps one session alive across all the questions.
+        async with self:
+            return await asyncio.gather(*(bounded(q) for q in questions))
+
+    def ask(self, question: str, events: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        events, prompt = self._context(question, events)
+        if not self._enabled():
+            return _disabled(prompt)
+        exact, key = cache_key(question, events)
+        cached = self._cached_response(self.cache.lookup(exact, key), prompt)
+        if cached is not None:
+            return cached
+
+        payload = {"query": prompt}
+        try:
+            resp = self._http_session().post(self.endpoint, json=payload, timeout=self.timeout)
             resp.raise_for_status()
-            data = resp.json()
-            text = (
-                data.get("answer")
-                or data.get("response")
-                or data.get("text")
-                or data.get("output")
-                or json.dumps(data)
-            )
-            return {"text": text, "prompt": prompt, "raw": data}
+            # orjson (via event_queue.loads) parses the raw bytes without a str decode pass.
+            response = _answer_from(event_queue.loads(resp.content), prompt)
         except Exception as exc:
-            return {
-                "text": f"LLM request failed: {exc}",
-                "prompt": prompt,
-                "raw": {},
-            }
+            return _failed(exc, prompt)
+        self.cache.store(exact, key, response["text"])
+        return response
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def __enter__(self) -> "LLMClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -3,27 +3,46 @@ Utility to load the most robust available model.
 """
 
 from pathlib import Path
-from typing import Tuple, Any
+from typing import Dict, Tuple, Any
 
-import joblib
+import numpy as np
 
 import config
 
 
+# path -> (mtime_ns, model); a rewritten model file invalidates its entry.
+_MODEL_CACHE: Dict[Path, Tuple[int, Any]] = {}
+
+
 def load_best_model() -> Tuple[Any, Path]:
+    """
+    Load the first available candidate model, reusing the cached copy while the file is unchanged.
+
+    Large ndarray attributes are memory-mapped read-only; callers must not modify them.
+    """
     for candidate in config.MODEL_CANDIDATES:
         path = Path(config.MODEL_DIR) / candidate
         if path.exists():
-            model = joblib.load(path)
+            mtime = path.stat().st_mtime_ns
+            cached = _MODEL_CACHE.get(path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1], path
+            import joblib  # deferred so a cache hit never pays the joblib/sklearn import
+
+            model = joblib.load(path, mmap_mode="r")
+            _MODEL_CACHE[path] = (mtime, model)
             return model, path
     raise FileNotFoundError(f"no model found in {config.MODEL_CANDIDATES}")
 
 
-def predict_with_confidence(model, X):
+def predict_with_confidence(model, X) -> Tuple[np.ndarray, np.ndarray]:
+    """Predicted labels and the per-sample probability of each predicted label."""
     if hasattr(model, "predict_proba"):
+        # Labels come from the same probabilities, so the pipeline only runs once.
         probs = model.predict_proba(X)
-        preds = model.predict(X)
-        conf = float(probs.max())
+        idx = probs.argmax(axis=1)
+        preds = model.classes_[idx]
+        conf = probs[np.arange(len(idx)), idx]
         return preds, conf
     preds = model.predict(X)
-    return preds, 1.0
+    return preds, np.ones(len(preds))
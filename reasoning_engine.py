@@ -2,31 +2,57 @@
 Minimal reasoning helper for desktop testing.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Sequence
 
+import numpy as np
 
-def build_reasoning(prediction: Any, confidence: float, quality: Dict[str, float]) -> str:
-    notes = []
-    snr = quality.get("snr_db")
-    if snr is not None:
-        if snr < 5:
-            notes.append("very noisy; try again closer to the surface")
-        elif snr < 10:
-            notes.append("noisy; result may be unstable")
-    if quality.get("calibrated") is False:
-        notes.append("no calibration applied")
-    energy = quality.get("spectral_energy")
-    if energy is not None:
-        if energy < 0.05:
-            notes.append("low-energy sweep; tap harder or closer")
-        elif energy > 0.3:
-            notes.append("strong impact energy")
-    centroid = quality.get("spectral_centroid")
-    if centroid is not None and centroid > 12000:
-        notes.append("high-frequency emphasis; metallic or sharp tap likely")
-    entropy = quality.get("spectral_entropy")
-    if entropy is not None and entropy > 8:
-        notes.append("complex frequency mix; double-check the material")
 
+# (quality key, predicate, note), checked in order. Predicates use operators that work on
+# both scalars and numpy arrays so the batch path can reuse them; NaN never triggers a note.
+_RULES = (
+    ("snr_db", lambda v: v < 5, "very noisy; try again closer to the surface"),
+    ("snr_db", lambda v: (v >= 5) & (v < 10), "noisy; result may be unstable"),
+    (
+        "calibrated",
+        lambda v: np.logical_not(v) if isinstance(v, np.ndarray) else v is False,
+        "no calibration applied",
+    ),
+    ("spectral_energy", lambda v: v < 0.05, "low-energy sweep; tap harder or closer"),
+    ("spectral_energy", lambda v: v > 0.3, "strong impact energy"),
+    (
+        "spectral_centroid",
+        lambda v: v > 12000,
+        "high-frequency emphasis; metallic or sharp tap likely",
+    ),
+    ("spectral_entropy", lambda v: v > 8, "complex frequency mix; double-check the material"),
+)
+
+
+def _format(prediction: Any, confidence: float, notes: List[str]) -> str:
     head = f"Detected {prediction} (conf {confidence:.2f})"
     return head + (". Notes: " + "; ".join(notes) if notes else "")
+
+
+def build_reasoning(prediction: Any, confidence: float, quality: Dict[str, float]) -> str:
+    notes = [
+        note
+        for key, predicate, note in _RULES
+        if (value := quality.get(key)) is not None and predicate(value)
+    ]
+    return _format(prediction, confidence, notes)
+
+
+def build_reasoning_batch(
+    predictions: Sequence[Any], confidences: Sequence[float], qualities: np.ndarray
+) -> List[str]:
+    """build_reasoning over a structured array of qualities; missing fields are skipped."""
+    fields = qualities.dtype.names or ()
+    masks = [
+        (note, np.asarray(predicate(qualities[key]), dtype=bool))
+        for key, predicate, note in _RULES
+        if key in fields
+    ]
+    return [
+        _format(pred, conf, [note for note, mask in masks if mask[i]])
+        for i, (pred, conf) in enumerate(zip(predictions, confidences))
+    ]
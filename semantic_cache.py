@@ -0,0 +1,104 @@
+"""
+Semantic cache for LLM answers.
+
+Each entry has an exact key (a hash of the rounded recent events: prediction, device,
+confidence, SNR and stats) and a fuzzy key (the question). Lookups filter on the exact key
+and only compare questions by sentence-transformers MiniLM embedding distance in a
+persistent Chroma collection, so an answer is never reused for a different capture.
+Both libraries are optional and imported on first use; without them every lookup misses
+and stores are no-ops.
+"""
+
+import hashlib
+import importlib.util
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import config
+
+
+COLLECTION_NAME = "llm_answers"
+
+
+def _available() -> bool:
+    # Checked without importing: chromadb and sentence-transformers (torch) are slow to load.
+    return all(
+        importlib.util.find_spec(name) is not None
+        for name in ("chromadb", "sentence_transformers")
+    )
+
+
+class SemanticCache:
+    def __init__(
+        self,
+        path: Path = config.LLM_CACHE_DIR,
+        threshold: float = config.LLM_CACHE_THRESHOLD,
+        ttl: float = config.LLM_CACHE_TTL_SEC,
+    ):
+        self.path = Path(path)
+        self.threshold = threshold
+        self.ttl = ttl
+        self.enabled = _available()
+        self._model = None
+        self._collection = None
+        # ask_async reaches _ensure from several worker threads; load the model only once.
+        self._init_lock = threading.Lock()
+
+    def _ensure(self) -> bool:
+        if not self.enabled:
+            return False
+        if self._collection is not None:
+            return True
+        with self._init_lock:
+            if self._collection is not None or not self.enabled:
+                return self.enabled
+            try:
+                import chromadb
+                from sentence_transformers import SentenceTransformer
+
+                self._model = SentenceTransformer(config.LLM_CACHE_MODEL)
+                self.path.mkdir(parents=True, exist_ok=True)
+                client = chromadb.PersistentClient(path=str(self.path))
+                self._collection = client.get_or_create_collection(
+                    COLLECTION_NAME, metadata={"hnsw:space": "cosine"}
+                )
+            except Exception:
+                # Model download or store setup failed; run uncached rather than erroring.
+                self.enabled = False
+                return False
+        return True
+
+    def _embed(self, key: str):
+        return self._model.encode([key], normalize_embeddings=True).tolist()
+
+    def lookup(self, exact: str, key: str) -> Optional[Dict[str, Any]]:
+        if not self._ensure():
+            return None
+        try:
+            result = self._collection.query(
+                query_embeddings=self._embed(key),
+                n_results=1,
+                where={"$and": [{"exact": exact}, {"ttl": {"$gt": time.time()}}]},
+            )
+        except Exception:
+            return None
+        distances = result.get("distances") or [[]]
+        if not distances[0] or distances[0][0] >= self.threshold:
+            return None
+        return result["metadatas"][0][0]
+
+    def store(self, exact: str, key: str, text: str) -> None:
+        if not self._ensure():
+            return
+        entry_id = hashlib.blake2b(f"{exact}:{key}".encode("utf-8"), digest_size=16).hexdigest()
+        try:
+            self._collection.upsert(
+                ids=[entry_id],
+                embeddings=self._embed(key),
+                documents=[key],
+                metadatas=[{"exact": exact, "text": text, "ttl": time.time() + self.ttl}],
+            )
+        except Exception:
+            pass
@@ -1,13 +1,14 @@
+import asyncio
+import http.server
 import json
 import os
+import threading
 from pathlib import Path
 
 import baseline_cache
-import joblib
 import numpy as np
-import pandas as pd
 import pytest
-from sklearn.dummy import DummyClassifier
+from scipy.io import wavfile
 
 import backend_client
 import config
@@ -19,6 +20,28 @@ import model_manager
 import reasoning_engine as reasoning
 
 
+# Heavy modules (sklearn, joblib, the training script) load only for the tests that use them.
+@pytest.fixture(scope="module")
+def joblib():
+    import joblib
+
+    return joblib
+
+
+@pytest.fixture(scope="module")
+def DummyClassifier():
+    from sklearn.dummy import DummyClassifier
+
+    return DummyClassifier
+
+
+@pytest.fixture(scope="module")
+def train_model():
+    import train_model
+
+    return train_model
+
+
 def test_preprocess_signal_returns_values():
     sr = config.TARGET_SAMPLE_RATE
     t = np.linspace(0, 1, sr, endpoint=False)
@@ -32,9 +55,26 @@ def test_fft_log_magnitude():
     sr = config.TARGET_SAMPLE_RATE
     t = np.linspace(0, 0.1, int(sr * 0.1), endpoint=False)
     x = np.sin(2 * np.pi * 1500 * t).astype(np.float32)
-    df = feat.fft(x, log_mag=True, sr=sr)
-    assert not df.isnull().values.any()
-    assert df.shape[1] > 0
+    freqs, values = feat.fft(x, log_mag=True, sr=sr)
+    assert not np.isnan(values).any()
+    assert values.dtype == np.float32
+    assert freqs.shape == values.shape and values.size > 0
+
+
+def test_load_wav_max_seconds(tmp_path):
+    sr = config.TARGET_SAMPLE_RATE
+    path = tmp_path / "long.wav"
+    wavfile.write(path, sr, np.zeros(sr, dtype=np.int16))
+    samples, out_sr = feat.load_wav(path, target_sr=sr, max_seconds=0.25)
+    assert out_sr == sr and samples.shape == (sr // 4,)
+    assert feat.load_wav(path, target_sr=sr)[0].shape == (sr,)
+
+
+def test_avg_log_thresh_matches_two_pass():
+    mag = np.random.default_rng(0).random((64, 40)).astype(np.float32) * 3 + 1e-6
+    for thresh in (0, 0.2):
+        expected = feat.avg_thresh(np.log10(mag), thresh=thresh)
+        assert np.allclose(feat.avg_log_thresh(mag, thresh=thresh), expected, atol=1e-6)
 
 
 def test_spectral_summary_basic_stats():
@@ -43,7 +83,7 @@ def test_spectral_summary_basic_stats():
     x = np.sin(2 * np.pi * 1500 * t).astype(np.float32)
     processed, _ = feat.preprocess_signal(x, sr)
     freqs, _, mag = feat.compute_spectrum(processed, sr)
-    stats = feat.spectral_summary(freqs, mag, processed, sr)
+    stats = feat.spectral_summary(freqs, mag, processed, sr, compute_mel=True)
     assert "spectral_centroid" in stats
     assert stats["spectral_centroid"] >= 0
     assert "mfcc_mean_0" in stats
@@ -66,6 +106,42 @@ def test_event_queue_roundtrip(monkeypatch, tmp_path):
     assert event in event_queue.tail_events(5)
 
 
+def test_event_queue_tail_reads_backwards(monkeypatch, tmp_path):
+    path = tmp_path / "queue.jsonl"
+    monkeypatch.setattr(config, "OFFLINE_QUEUE_PATH", path)
+    monkeypatch.setattr(event_queue, "TAIL_BLOCK_SIZE", 64)
+    for idx in range(50):
+        event_queue.enqueue({"type": "prediction", "timestamp": float(idx), "note": "x" * idx})
+    with path.open("a") as f:
+        f.write("not json\n\n")
+    tail = event_queue.tail_events(3)
+    assert [evt["timestamp"] for evt in tail] == [47.0, 48.0, 49.0]
+    assert len(event_queue.tail_events(100)) == 50
+
+
+def test_event_queue_ring_serves_tail(monkeypatch, tmp_path):
+    path = tmp_path / "queue.jsonl"
+    monkeypatch.setattr(config, "OFFLINE_QUEUE_PATH", path)
+    monkeypatch.setattr(event_queue, "TAIL_RING_SIZE", 4)
+    for idx in range(6):
+        event_queue.enqueue({"type": "prediction", "timestamp": float(idx)})
+    assert [evt["timestamp"] for evt in event_queue.tail_events(2)] == [4.0, 5.0]
+    event_queue.enqueue({"type": "prediction", "timestamp": 6.0})
+    seeds = []
+    seed = event_queue._seed_ring
+    monkeypatch.setattr(event_queue, "_seed_ring", lambda *a: seeds.append(a) or seed(*a))
+    assert [evt["timestamp"] for evt in event_queue.tail_events(3)] == [4.0, 5.0, 6.0]
+    assert seeds == []
+    # Lines from another writer, truncation and deletion are all picked up from disk.
+    with path.open("ab") as f:
+        f.write(event_queue.dumps({"type": "prediction", "timestamp": 7.0}) + b"\n")
+    assert [evt["timestamp"] for evt in event_queue.tail_events(2)] == [6.0, 7.0]
+    path.write_bytes(event_queue.dumps({"type": "prediction", "timestamp": 8.0}) + b"\n")
+    assert [evt["timestamp"] for evt in event_queue.tail_events(3)] == [8.0]
+    path.unlink()
+    assert event_queue.tail_events(3) == []
+
+
 def test_backend_client_fallback(monkeypatch):
     seen = []
 
@@ -79,7 +155,7 @@ def test_backend_client_fallback(monkeypatch):
     assert seen and seen[0] == payload
 
 
-def test_model_manager_load_best(monkeypatch, tmp_path):
+def test_model_manager_load_best(monkeypatch, tmp_path, joblib, DummyClassifier):
     model = DummyClassifier(strategy="most_frequent")
     data = np.array([[0], [1]])
     target = np.array([0, 0])
@@ -91,17 +167,72 @@ def test_model_manager_load_best(monkeypatch, tmp_path):
     loaded, path = model_manager.load_best_model()
     assert isinstance(path, Path)
     assert path.name == "test_model.joblib"
+    assert model_manager.load_best_model()[0] is loaded
     preds, conf = model_manager.predict_with_confidence(loaded, data)
     assert preds.shape[0] == data.shape[0]
-    assert conf == 1.0
+    assert conf.shape == (data.shape[0],) and (conf == 1.0).all()
 
 
 def test_baseline_cache_populates(monkeypatch, tmp_path):
-    monkeypatch.setattr(config, "LEGACY_SUMMARY_DIR", config.BASE_DIR / "data")
+    sr = config.TARGET_SAMPLE_RATE
+    dataset_dir = tmp_path / "dataset_1"
+    dataset_dir.mkdir()
+    t = np.linspace(0, 0.5, sr // 2, endpoint=False)
+    tone = (np.sin(2 * np.pi * 2000 * t) * 8000).astype(np.int16)
+    wavfile.write(dataset_dir / "control_1.wav", sr, tone)
+    monkeypatch.setattr(config, "LEGACY_SUMMARY_DIR", tmp_path / "missing")
+    monkeypatch.setattr(config, "BASELINE_CACHE_DIR", tmp_path / "cache")
+    baseline = baseline_cache.get_baseline(dataset_dir)
+    assert baseline.freqs.shape == baseline.vals.shape
+    assert np.all(np.diff(baseline.freqs) > 0)
+    assert isinstance(baseline.vals, np.memmap) and baseline.vals.dtype == np.float32
+    assert (tmp_path / "cache" / "dataset_1.freqs.npy").exists()
+    assert (tmp_path / "cache" / "dataset_1.vals.npy").exists()
+    cached = baseline_cache.get_baseline(dataset_dir)
+    assert np.array_equal(cached.freqs, baseline.freqs)
+    assert np.allclose(cached.vals, baseline.vals)
+    # An edited control invalidates the cached pair.
+    calls = []
+    compute = baseline_cache._compute_from_controls
+    monkeypatch.setattr(
+        baseline_cache, "_compute_from_controls", lambda d: calls.append(d) or compute(d)
+    )
+    baseline_cache.get_baseline(dataset_dir)
+    assert calls == []
+    wavfile.write(dataset_dir / "control_1.wav", sr, tone[: sr // 4])
+    baseline_cache.get_baseline(dataset_dir)
+    assert calls == [dataset_dir]
+
+
+def test_collect_features_builds_matrix(monkeypatch, tmp_path, train_model):
+    sr = config.TARGET_SAMPLE_RATE
+    dataset_dir = tmp_path / "dataset_1"
+    dataset_dir.mkdir()
+    rng = np.random.default_rng(0)
+    t = np.arange(sr // 2) / sr
+    for idx, (name, freq) in enumerate([("metal", 2000), ("metal", 2500), ("glass", 4000)]):
+        bursts = np.sin(2 * np.pi * freq * t) * np.exp(-((t % 0.1) * 60))
+        noisy = bursts + rng.normal(0, 0.01, t.size)
+        wavfile.write(dataset_dir / f"{name}_{idx}.wav", sr, (noisy * 8000).astype(np.int16))
+    monkeypatch.setattr(config, "DATA_AUDIO_DIR", tmp_path)
+    monkeypatch.setattr(config, "LEGACY_SUMMARY_DIR", tmp_path / "missing")
     monkeypatch.setattr(config, "BASELINE_CACHE_DIR", tmp_path / "cache")
-    baseline = baseline_cache.get_baseline(config.DATA_AUDIO_DIR / "dataset_1")
-    assert isinstance(baseline, pd.Series)
-    assert (tmp_path / "cache" / "dataset_1_baseline.joblib").exists()
+    monkeypatch.setattr(config, "FEATURE_CACHE_DIR", tmp_path / "features")
+    monkeypatch.setitem(train_model.MAX_SAMPLES_PER_LABEL, "metal", 1)
+    df = train_model.collect_features()
+    assert sorted(df["label"]) == ["glass", "metal"]
+    assert len(list((tmp_path / "features").glob("*.npy"))) == 3
+    cached = train_model.collect_features()
+    assert np.array_equal(cached.drop(columns="label"), df.drop(columns="label"))
+    assert list(df.columns[-len(feat.EXTRA_KEYS_ORDERED) - 1 : -1]) == list(feat.EXTRA_KEYS_ORDERED)
+    assert df.drop(columns="label").dtypes.eq(np.float32).all()
+
+
+def test_align_bins_fills_missing():
+    src_freqs = np.array([10, 20, 30], dtype=np.int32)
+    src_values = np.array([1.0, 2.0, 3.0], dtype=np.float32)
+    aligned = feat.align_bins(src_freqs, src_values, np.array([5, 20, 30, 40]))
+    assert aligned.tolist() == [0.0, 2.0, 3.0, 0.0]
 
 
 def test_reasoning_low_snr():
@@ -109,6 +240,17 @@ def test_reasoning_low_snr():
     assert "noisy" in message.lower()
 
 
+def test_reasoning_batch_matches_scalar():
+    qualities = np.array(
+        [(2.0, False, 0.4), (12.0, True, 0.01)],
+        dtype=[("snr_db", "f8"), ("calibrated", "?"), ("spectral_energy", "f8")],
+    )
+    messages = reasoning.build_reasoning_batch(["metal", "glass"], [0.9, 0.4], qualities)
+    for message, row, pred, conf in zip(messages, qualities, ["metal", "glass"], [0.9, 0.4]):
+        quality = {name: row[name].item() for name in qualities.dtype.names}
+        assert message == reasoning.build_reasoning(pred, conf, quality)
+
+
 def test_llm_client_prompt_building(monkeypatch):
     sample_events = [
         {"type": "prediction", "timestamp": 1.0, "prediction": "metal", "confidence": 0.8, "snr_db": 12.0}
@@ -118,3 +260,59 @@ def test_llm_client_prompt_building(monkeypatch):
     response = client.ask("What should the user do?")
     assert "LLM disabled" in response["text"]
     assert "Recent classifications" in response["prompt"]
+
+
+def test_llm_client_ask_many_keeps_order(monkeypatch):
+    sample_events = [{"type": "prediction", "timestamp": 1.0, "prediction": "glass", "confidence": 0.7}]
+    monkeypatch.setattr(event_queue, "tail_events", lambda limit: sample_events)
+    client = llm_client.LLMClient(endpoint=None, api_key=None)
+    questions = ["First?", "Second?", "Third?"]
+    responses = asyncio.run(client.ask_many(questions))
+    assert [r["prompt"].split("Question: ")[1].splitlines()[0] for r in responses] == questions
+
+
+@pytest.fixture
+def llm_endpoint():
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            body = b'{"answer": "ok"}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+
+
+def test_llm_client_ask_many_across_event_loops(llm_endpoint):
+    cache = llm_client.SemanticCache()
+    cache.enabled = False
+    client = llm_client.LLMClient(endpoint=llm_endpoint, api_key="key", cache=cache)
+    events = [{"type": "prediction", "timestamp": 1.0, "prediction": "metal"}]
+    for _ in range(2):
+        responses = asyncio.run(client.ask_many(["First?", "Second?"], events=events))
+        assert [r["text"] for r in responses] == ["ok", "ok"]
+        assert client._aio_session is None
+
+
+def test_llm_event_signature_rounds_and_drops_timestamp():
+    first = [{"timestamp": 1.0, "prediction": "metal", "confidence": 0.81, "snr_db": 12.2}]
+    second = [{"timestamp": 9.0, "prediction": "metal", "confidence": 0.79, "snr_db": 11.8}]
+    assert llm_client.cache_key("Retry?", first) == llm_client.cache_key("Retry?", second)
+    # Every event field is matched exactly; only the question is left to the embedding.
+    exact, question = llm_client.cache_key("Retry?", first)
+    assert question == "Retry?"
+    assert llm_client.cache_key("Accept?", first)[0] == exact
+    for change in ({"prediction": "glass"}, {"confidence": 0.3}, {"snr_db": 4.0}):
+        assert llm_client.cache_key("Retry?", [dict(first[0], **change)])[0] != exact
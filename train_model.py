@@ -2,11 +2,14 @@
 Train a stronger classification pipeline using the restored datasets.
 """
 
+import hashlib
+import os
 from collections import Counter, defaultdict
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import joblib
+from joblib import Parallel, delayed
 import numpy as np
 import pandas as pd
 from sklearn.decomposition import PCA
@@ -19,12 +22,17 @@ from sklearn.preprocessing import StandardScaler
 import config
 from baseline_cache import get_baseline
 from feature_extractor import (
+    EXTRA_KEYS_ORDERED,
+    align_bins,
     compute_spectrum,
+    feature_columns,
     fft,
     load_wav,
     preprocess_signal,
     rms_db,
     spectral_summary,
+    spectrum_freqs,
+    warmup,
 )
 
 
@@ -62,80 +70,177 @@ MAX_SAMPLES_PER_LABEL = {
 
 INCLUDED_DATASETS = ["dataset_1", "dataset_2"]
 
+# Bump whenever load/preprocess/spectrum/summary code changes what a cached row holds.
+FEATURE_VERSION = 1
+
+
+def _candidate_wavs(dataset_dir: Path) -> List[Tuple[Path, str]]:
+    candidates = []
+    for wav in sorted(dataset_dir.glob("*.wav")):
+        lower = wav.name.lower()
+        if "control" in lower or "silence" in lower:
+            continue
+        label = derive_label(lower)
+        if label:
+            candidates.append((wav, label))
+    return candidates
+
+
+def _extract_row(wav: Path, freq_index: np.ndarray, workers: int = -1) -> np.ndarray:
+    """
+    Baseline-free feature row on ``freq_index`` followed by the raw summary stats.
+
+    An empty array marks a file rejected by the quality gates.
+    """
+    rejected = np.empty(0, dtype=np.float32)
+    samples, sr = load_wav(
+        wav, target_sr=config.TARGET_SAMPLE_RATE, max_seconds=config.MAX_CLIP_SEC
+    )
+    if samples.size < sr * config.MIN_SAMPLES_SEC:
+        return rejected
+    if float(np.abs(samples).max()) < config.PRE_SILENCE_THRESH:
+        return rejected
+    proc, snr = preprocess_signal(samples, sr)
+    if snr < config.MIN_SNR_DB:
+        return rejected
+    level_db = rms_db(proc)
+    if level_db < config.SILENCE_DB_THRESHOLD:
+        return rejected
+
+    freqs, _, mag = compute_spectrum(proc, sr, workers=workers)
+    if mag.size == 0:
+        return rejected
+
+    freqs_int, values = fft(
+        proc,
+        log_mag=True,
+        thresh=0,
+        precomputed=(freqs, mag),
+    )
+    # The bin layout is fixed by sr/n_fft/band, so this is only a guard.
+    if not np.array_equal(freqs_int, freq_index):
+        values = align_bins(freqs_int, values, freq_index)
+    extra = spectral_summary(freqs, mag, proc, sr, compute_mel=True)
+    stats = np.fromiter(
+        (extra.get(key, 0.0) for key in EXTRA_KEYS_ORDERED),
+        dtype=np.float32,
+        count=len(EXTRA_KEYS_ORDERED),
+    )
+    return np.concatenate([values, stats])
+
+
+def _feature_cache_path(wav: Path, cache_dir: Path) -> Path:
+    # Everything that changes the row (or the accept/reject decision) is part of the key.
+    settings = (
+        FEATURE_VERSION,
+        config.TARGET_SAMPLE_RATE,
+        config.N_FFT,
+        config.FMIN,
+        config.FMAX,
+        config.WINDOW,
+        config.MAX_CLIP_SEC,
+        config.MIN_SAMPLES_SEC,
+        config.PRE_SILENCE_THRESH,
+        config.MIN_SNR_DB,
+        config.SILENCE_DB_THRESHOLD,
+    )
+    digest = hashlib.blake2b(wav.read_bytes(), digest_size=16)
+    digest.update(repr(settings).encode("utf-8"))
+    return cache_dir / f"{digest.hexdigest()}_v{FEATURE_VERSION}.npy"
+
+
+def _cached_row(
+    wav: Path, freq_index: np.ndarray, cache_dir: Path, workers: int = -1
+) -> np.ndarray:
+    cache_path = _feature_cache_path(wav, cache_dir)
+    if cache_path.exists():
+        try:
+            return np.load(cache_path)
+        except (OSError, ValueError):
+            pass
+    row = _extract_row(wav, freq_index, workers)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    # Workers may race on the same key; write privately, then rename into place.
+    tmp_path = cache_path.with_name(f"{cache_path.stem}.{os.getpid()}.tmp.npy")
+    np.save(tmp_path, row)
+    os.replace(tmp_path, cache_path)
+    return row
+
+
+def _process_wav(
+    wav: Path, baseline_vals: Optional[np.ndarray], freq_index: np.ndarray, cache_dir: Path
+) -> Optional[np.ndarray]:
+    """Feature row for one WAV on ``freq_index`` (None if rejected); runs in joblib workers."""
+    # One FFT thread per worker: the pool already spreads files across the cores.
+    row = _cached_row(wav, freq_index, cache_dir, workers=1)
+    if row.size == 0:
+        return None
+    values = row[: len(freq_index)]
+    if baseline_vals is not None:
+        values -= baseline_vals
+    if np.isnan(values).any():
+        return None
+    return np.nan_to_num(row, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+
 
 def collect_features() -> pd.DataFrame:
     base = config.DATA_AUDIO_DIR
-    rows = []
-    freq_index = None
+    datasets = [d for d in sorted(base.glob("dataset_*")) if d.name in INCLUDED_DATASETS]
+    candidates = {dataset_dir: _candidate_wavs(dataset_dir) for dataset_dir in datasets}
+    freq_index = spectrum_freqs(config.TARGET_SAMPLE_RATE).astype(np.int32)
+
+    # Upper bound on accepted rows so the feature matrix is allocated once.
+    available = Counter(label for wavs in candidates.values() for _, label in wavs)
+    n_rows = sum(
+        min(n, MAX_SAMPLES_PER_LABEL.get(label, 200)) for label, n in available.items()
+    )
+    features_out = np.empty(
+        (n_rows, len(freq_index) + len(EXTRA_KEYS_ORDERED)), dtype=np.float32
+    )
+    labels_out = np.empty(n_rows, dtype=object)
+    n_filled = 0
     counts = defaultdict(int)
 
-    for dataset_dir in sorted(base.glob("dataset_*")):
-        if dataset_dir.name not in INCLUDED_DATASETS:
-            continue
-
+    # Baselines are resolved (and cached) in the parent; every file of every dataset then
+    # goes through one worker pool, so datasets don't serialize behind each other.
+    tasks = []
+    for dataset_dir, wavs in candidates.items():
         baseline = get_baseline(dataset_dir)
+        baseline_vals = None
+        if baseline is not None:
+            baseline_vals = align_bins(baseline.freqs, baseline.vals, freq_index)
+        tasks.extend((wav, label, baseline_vals) for wav, label in wavs)
+
+    # Passed explicitly: loky workers re-import config rather than inherit parent state.
+    cache_dir = Path(config.FEATURE_CACHE_DIR)
+    rows = Parallel(n_jobs=config.N_WORKERS, return_as="generator")(
+        delayed(_process_wav)(wav, baseline_vals, freq_index, cache_dir)
+        for wav, _, baseline_vals in tasks
+    )
+    for (_, label, _), row in zip(tasks, rows):
+        # Files are processed in sorted order, so the per-label cap keeps the first rows.
+        if row is None or counts[label] >= MAX_SAMPLES_PER_LABEL.get(label, 200):
+            continue
+        counts[label] += 1
+        features_out[n_filled] = row
+        labels_out[n_filled] = label
+        n_filled += 1
 
-        for wav in sorted(dataset_dir.glob("*.wav")):
-            lower = wav.name.lower()
-            if "control" in lower or "silence" in lower:
-                continue
-            label = derive_label(lower)
-            if not label:
-                continue
-
-            samples, sr = load_wav(wav, target_sr=config.TARGET_SAMPLE_RATE)
-            proc, snr = preprocess_signal(samples, sr)
-            if snr < config.MIN_SNR_DB:
-                continue
-            level_db = rms_db(proc)
-            if level_db < config.SILENCE_DB_THRESHOLD:
-                continue
-
-            freqs, _, mag = compute_spectrum(proc, sr)
-            if mag.size == 0:
-                continue
-
-            vector = fft(
-                proc,
-                log_mag=True,
-                thresh=0,
-                precomputed=(freqs, mag),
-            )
-            if baseline is not None:
-                baseline_aligned = baseline.reindex(vector.columns, fill_value=0)
-                vector = vector.subtract(baseline_aligned, axis=1)
-
-            if counts[label] >= MAX_SAMPLES_PER_LABEL.get(label, 200):
-                continue
-            counts[label] += 1
-            if vector.isnull().any().any():
-                continue
-            if freq_index is None:
-                freq_index = vector.columns
-            vector = vector.reindex(columns=freq_index, fill_value=0)
-            vector = vector.fillna(0)
-
-            extra = spectral_summary(freqs, mag, proc, sr)
-            combined = pd.concat([vector.iloc[0], pd.Series(extra)])
-            combined = combined.replace([np.inf, -np.inf], 0).fillna(0)
-            rows.append({"features": combined, "label": label})
-
-    if not rows:
+    if n_filled == 0:
         raise RuntimeError("No training examples found.")
 
     print("Collected training counts:", Counter(counts))
 
-    feature_df = pd.DataFrame([r["features"] for r in rows], index=range(len(rows)))
-    feature_df.columns = feature_df.columns.astype(str)
-    labels = [r["label"] for r in rows]
-    feature_df["label"] = labels
+    feature_df = pd.DataFrame(features_out[:n_filled], columns=feature_columns(freq_index))
+    feature_df["label"] = labels_out[:n_filled]
     return feature_df
 
 
 def main():
+    warmup()
     print("Collecting features from audio datasets…")
     df = collect_features()
-    X = df.drop(columns="label")
+    X = df.drop(columns="label").astype(np.float32, copy=False)
     y = df["label"]
 
     print("Splitting data…")
@@ -152,7 +257,10 @@ def main():
     pipeline = Pipeline(
         [
             ("scaler", StandardScaler()),
-            ("pca", PCA(n_components=n_components)),
+            (
+                "pca",
+                PCA(n_components=n_components, svd_solver="randomized", random_state=42),
+            ),
             (
                 "hgb",
                 HistGradientBoostingClassifier(
@@ -176,7 +284,9 @@ def main():
     print(classification_report(y_test, pipeline.predict(X_test)))
 
     target = Path(config.BASE_DIR) / "robust_model.joblib"
-    joblib.dump(pipeline, target)
+    # Uncompressed on purpose: model_manager loads with mmap_mode="r", which joblib
+    # ignores for compressed files.
+    joblib.dump(pipeline, target, protocol=5)
     print(f"Saved robust model to {target}")
 
 